@@ -1,157 +1,552 @@
-from flask import Flask, jsonify, request
+import hashlib
+import os
+import secrets
+import sqlite3
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+import orjson
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from flask_swagger_ui import get_swaggerui_blueprint
 
+try:
+    # Optional: SIMD substring search over the packed search buffers.
+    from stringzilla import Str as SearchText
+except ImportError:
+    SearchText = bytes  # type: ignore[misc,assignment]
+
+try:
+    # Optional: multi-needle search compiled into a single automaton.
+    import hyperscan
+except ImportError:
+    hyperscan = None  # type: ignore[assignment]
+
+
+class ORJSONProvider(JSONProvider):
+    """Serve jsonify() and request.get_json() through orjson instead of stdlib json."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return Response(orjson.dumps(obj), mimetype="application/json")
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
 # -------------------------
-# Sample In-Memory Data
+# Data
 # -------------------------
-POSTS = [
-    {"id": 1, "title": "First Post", "content": "This is the first post."},
-    {"id": 2, "title": "Second Post", "content": "This is the second post."},
-    {"id": 3, "title": "Flask Tips", "content": "Using Flask to build APIs is fun."},
-    {"id": 4, "title": "Python Tricks", "content": "List comprehensions and generators are powerful."}
+# SQLite database shared by every worker process; created and seeded on first start.
+DATABASE_PATH = os.environ.get(
+    "MASTERBLOG_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "posts.db")
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Post:
+    """A blog post. Frozen, so a post inside a published snapshot never changes."""
+    id: int
+    title: str
+    content: str
+
+
+# Seeded into a newly created database.
+SAMPLE_POSTS = [
+    Post(1, "First Post", "This is the first post."),
+    Post(2, "Second Post", "This is the second post."),
+    Post(3, "Flask Tips", "Using Flask to build APIs is fun."),
+    Post(4, "Python Tricks", "List comprehensions and generators are powerful.")
 ]
 
+# Post fields that are searchable and sortable.
+TEXT_FIELDS = ("title", "content")
+
+# ?direction= values mapped to the sorted() reverse flag.
+SORT_DIRECTIONS = {"asc": False, "desc": True}
+
+# add_post error messages indexed by a bitmask: 1 = title missing, 2 = content missing.
+MISSING_FIELDS_MESSAGES = (
+    "",
+    "Missing field(s): title",
+    "Missing field(s): content",
+    "Missing field(s): title, content",
+)
+
+# Most distinct searches whose bodies are cached per snapshot.
+SEARCH_CACHE_SIZE = 256
+
+# Prefixes every ETag. Read from the database at startup, so all workers
+# agree on it while a recreated database never reuses old tags.
+_ETAG_PREFIX = ""
+
+# Below this many posts a plain scan is cheaper than a Hyperscan pass.
+HYPERSCAN_MIN_POSTS = 64
+
+# A Hyperscan database's scratch space can only be used by one scan at a time.
+_HYPERSCAN_LOCK = threading.Lock()
+
+
+class Corpus(NamedTuple):
+    """One lowercased field packed into a single NUL-separated UTF-8 buffer."""
+    buffer: bytes
+    text: SearchText   # the same buffer, wrapped for SearchText.find()
+    starts: list[int]  # byte offset where each post begins
+    ids: list[int]     # post id at each position
+
+
+class Snapshot(NamedTuple):
+    """
+    A read-only copy of the database at one user_version. Writers never modify
+    a published snapshot; they build a new one and swap it into _STATE, so
+    readers work on whichever snapshot they picked up without taking a lock.
+    The caches start empty and only ever hold values derived from this snapshot.
+    """
+    version: int                              # the database's PRAGMA user_version
+    posts: dict[int, Post]                    # id -> post, oldest first
+    post_json: dict[int, bytes]               # id -> serialized post
+    lower: dict[str, dict[int, str]]          # field -> id -> lowercased value
+    list_cache: dict[tuple[str, str], bytes]  # GET /api/posts bodies by (sort, direction)
+    corpus_cache: dict[str, Corpus]           # packed search buffer per field
+    # search bodies by (title terms, content terms), at most SEARCH_CACHE_SIZE
+    search_cache: dict[tuple[tuple[str, ...], tuple[str, ...]], bytes]
+
+    @property
+    def etag(self) -> str:
+        """ETag for responses that depend on all of this snapshot's posts."""
+        return f"{_ETAG_PREFIX}-{self.version}"
+
 # -------------------------
 # Helpers
 # -------------------------
-def get_post_index_by_id(post_id: int) -> int:
-    """Return the index of the post with the given ID, or -1 if not found."""
-    for i, post in enumerate(POSTS):
-        if post["id"] == post_id:
-            return i
-    return -1
+def new_snapshot(
+    version: int,
+    posts: dict[int, Post],
+    post_json: dict[int, bytes],
+    lower: dict[str, dict[int, str]]
+) -> Snapshot:
+    """Create a snapshot with empty caches."""
+    return Snapshot(version, posts, post_json, lower, {}, {}, {})
+
+
+def make_snapshot(version: int, posts: dict[int, Post]) -> Snapshot:
+    """Build a snapshot from scratch, serializing and lowercasing every post."""
+    post_json = {post_id: orjson.dumps(post) for post_id, post in posts.items()}
+    lower = {
+        field: {post_id: getattr(post, field).lower() for post_id, post in posts.items()}
+        for field in TEXT_FIELDS
+    }
+    return new_snapshot(version, posts, post_json, lower)
+
 
+def with_post(state: Snapshot, post: Post) -> Snapshot:
+    """Return a new snapshot with post inserted, or replaced if its id exists."""
+    post_id = post.id
+    posts = {**state.posts, post_id: post}
+    post_json = {**state.post_json, post_id: orjson.dumps(post)}
+    lower = {
+        field: {**column, post_id: getattr(post, field).lower()}
+        for field, column in state.lower.items()
+    }
+    return new_snapshot(state.version + 1, posts, post_json, lower)
 
-def next_id() -> int:
-    """Generate the next available unique ID."""
-    if not POSTS:
-        return 1
-    return max(post["id"] for post in POSTS) + 1
+
+def without_post(state: Snapshot, post_id: int) -> Snapshot:
+    """Return a new snapshot with the given post removed."""
+    posts = {key: post for key, post in state.posts.items() if key != post_id}
+    post_json = {key: body for key, body in state.post_json.items() if key != post_id}
+    lower = {
+        field: {key: value for key, value in column.items() if key != post_id}
+        for field, column in state.lower.items()
+    }
+    return new_snapshot(state.version + 1, posts, post_json, lower)
+
+
+def posts_body(state: Snapshot, post_ids: Iterable[int]) -> bytes:
+    """Assemble a JSON array body from the snapshot's pre-serialized posts."""
+    post_json = state.post_json
+    return b"[" + b",".join([post_json[post_id] for post_id in post_ids]) + b"]"
+
+
+def cached_list_body(state: Snapshot, sort: str = "", direction: str = "") -> bytes:
+    """
+    Return the cached GET /api/posts body, sorted by a TEXT_FIELDS column
+    when sort is given. Sorting only happens on a cache miss.
+    """
+    key = (sort, direction)
+    body = state.list_cache.get(key)
+    if body is None:
+        post_ids: Iterable[int] = state.posts
+        if sort:
+            post_ids = sorted(
+                state.posts,
+                key=state.lower[sort].__getitem__,
+                reverse=SORT_DIRECTIONS[direction]
+            )
+        body = posts_body(state, post_ids)
+        state.list_cache[key] = body
+    return body
+
+
+# Search scans the packed buffer instead of keeping a substring index
+# (trigram postings, suffix array). On ~1 MB of post text an index answers a
+# query in ~30 us against ~80 us for the SIMD scan, but building it costs
+# ~1 s and every write would need a rebuild for the next snapshot.
+def search_corpus(state: Snapshot, field: str) -> Corpus:
+    """Return the packed corpus for one lowercased field, building it on a miss."""
+    corpus = state.corpus_cache.get(field)
+    if corpus is None:
+        column = state.lower[field]
+        chunks = [value.encode("utf-8") for value in column.values()]
+        starts: list[int] = []
+        offset = 0
+        for chunk in chunks:
+            starts.append(offset)
+            offset += len(chunk) + 1
+        buffer = b"\0".join(chunks)
+        corpus = Corpus(buffer, SearchText(buffer), starts, list(column))
+        state.corpus_cache[field] = corpus
+    return corpus
+
+
+def scan_corpus(corpus: Corpus, needle: bytes) -> Iterator[int]:
+    """Yield ids of posts containing needle, skipping to the next post after each hit."""
+    find = corpus.text.find
+    starts = corpus.starts
+    position = find(needle)
+    while position != -1:
+        index = bisect_right(starts, position) - 1
+        yield corpus.ids[index]
+        if index + 1 == len(starts):
+            break
+        position = find(needle, starts[index + 1])
+
+
+@lru_cache(maxsize=128)
+def hyperscan_database(needles: tuple[str, ...]) -> "hyperscan.Database":
+    """Compile the needles as literal patterns into one block-mode database."""
+    expressions = [
+        "".join(f"\\x{byte:02x}" for byte in needle.encode("utf-8")).encode("ascii")
+        for needle in needles
+    ]
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions)
+    )
+    return database
+
+
+def find_posts(state: Snapshot, field: str, needles: tuple[str, ...]) -> set[int]:
+    """Return ids of posts whose lowercased field contains any of the needles."""
+    if any("\0" in needle for needle in needles):
+        # NUL is the corpus separator, so check such needles post by post.
+        return {
+            post_id
+            for post_id, value in state.lower[field].items()
+            if any(needle in value for needle in needles)
+        }
+
+    corpus = search_corpus(state, field)
+    matched: set[int] = set()
+    if hyperscan is not None and len(state.posts) > HYPERSCAN_MIN_POSTS:
+        def on_match(_id: int, _start: int, end: int, _flags: int, _context: object) -> None:
+            matched.add(corpus.ids[bisect_right(corpus.starts, end - 1) - 1])
+
+        with _HYPERSCAN_LOCK:
+            hyperscan_database(needles).scan(corpus.buffer, match_event_handler=on_match)
+        return matched
+
+    for needle in needles:
+        matched.update(scan_corpus(corpus, needle.encode("utf-8")))
+    return matched
+
+
+def conditional_response(body: bytes, etag: str) -> tuple[Response, int]:
+    """Serve a JSON body with an ETag, answering a matching If-None-Match with 304."""
+    response = json_body_response(body)
+    response.set_etag(etag)
+    response.make_conditional(request)
+    return response, response.status_code
+
+
+def is_blank(value: Any) -> bool:
+    """True if a required body field is absent, empty, or not a string."""
+    return not (value and isinstance(value, str))
+
+
+def query_terms(name: str) -> tuple[str, ...]:
+    """Return the non-blank, lowercased values of a repeatable query parameter."""
+    terms = (value.strip().lower() for value in request.args.getlist(name))
+    return tuple(dict.fromkeys(term for term in terms if term))
+
+
+def json_body_response(body: bytes) -> Response:
+    """
+    Wrap an already-serialized JSON body in a response. The bytes are
+    handed to the WSGI server as-is, without re-encoding or re-chunking.
+    """
+    return Response(body, mimetype="application/json", direct_passthrough=True)
+
+# -------------------------
+# Storage
+# -------------------------
+# Every write bumps PRAGMA user_version in the same transaction. Each worker
+# compares it with its snapshot's version per request and reloads on change,
+# so writes made by any worker become visible to all of them.
+_LOCAL = threading.local()
+
+
+def connect() -> sqlite3.Connection:
+    """Open a connection in autocommit mode; transactions are explicit."""
+    conn = sqlite3.connect(DATABASE_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+def db() -> sqlite3.Connection:
+    """Return this thread's connection, opening it on first use."""
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is None:
+        conn = _LOCAL.conn = connect()
+    return conn
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection, mode: str = "IMMEDIATE") -> Iterator[sqlite3.Connection]:
+    """Run a transaction, committing on success and rolling back on error."""
+    conn.execute(f"BEGIN {mode}")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def db_version(conn: sqlite3.Connection) -> int:
+    """Return the database's write counter (PRAGMA user_version)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def load_snapshot(conn: sqlite3.Connection) -> Snapshot:
+    """Read every post into a fresh snapshot. Call inside a transaction."""
+    rows = conn.execute("SELECT id, title, content FROM posts ORDER BY id")
+    return make_snapshot(db_version(conn), {row[0]: Post(*row) for row in rows})
+
+
+def init_db() -> Snapshot:
+    """Create and seed the database if needed, and return its current snapshot."""
+    global _ETAG_PREFIX
+    conn = connect()
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        with transaction(conn):
+            if db_version(conn) == 0:
+                conn.execute(
+                    "CREATE TABLE posts ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "title TEXT NOT NULL, "
+                    "content TEXT NOT NULL)"
+                )
+                conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                conn.execute("INSERT INTO meta VALUES ('etag_prefix', ?)", (secrets.token_hex(4),))
+                conn.executemany(
+                    "INSERT INTO posts (id, title, content) VALUES (?, ?, ?)",
+                    [(post.id, post.title, post.content) for post in SAMPLE_POSTS]
+                )
+                conn.execute("PRAGMA user_version = 1")
+            _ETAG_PREFIX = conn.execute(
+                "SELECT value FROM meta WHERE key = 'etag_prefix'"
+            ).fetchone()[0]
+            return load_snapshot(conn)
+    finally:
+        conn.close()
+
+
+def next_snapshot(conn: sqlite3.Connection, change: Callable[[Snapshot], Snapshot]) -> Snapshot:
+    """
+    Bump the database version inside the open write transaction and return
+    the matching snapshot: change() applied to _STATE if it is current, or a
+    full reload if another worker wrote in the meantime.
+    """
+    version = db_version(conn)
+    conn.execute(f"PRAGMA user_version = {version + 1}")
+    if _STATE.version == version:
+        return change(_STATE)
+    return load_snapshot(conn)
+
+
+def current_snapshot() -> Snapshot:
+    """Return the snapshot for the database's current version, reloading if stale."""
+    global _STATE
+    conn = db()
+    if db_version(conn) != _STATE.version:
+        with _WRITE_LOCK:
+            if db_version(conn) != _STATE.version:
+                with transaction(conn, "DEFERRED"):
+                    _STATE = load_snapshot(conn)
+    return _STATE
+
+
+# The current snapshot. Replaced (never mutated) by writers holding _WRITE_LOCK.
+_STATE = init_db()
+_WRITE_LOCK = threading.Lock()
 
 # -------------------------
 # API Endpoints
 # -------------------------
 
 @app.route("/api/posts", methods=["GET"])
-def list_posts():
+def list_posts() -> tuple[Response, int]:
     """
     List all posts with optional sorting:
       - ?sort=title|content
       - ?direction=asc|desc (default: asc)
     """
+    state = current_snapshot()
     sort = request.args.get("sort", "").strip().lower()
     direction = request.args.get("direction", "asc").strip().lower()
 
     if not sort:
-        return jsonify(POSTS), 200
+        return conditional_response(cached_list_body(state), state.etag)
 
-    allowed_fields = {"title", "content"}
-    allowed_directions = {"asc", "desc"}
-
-    if sort not in allowed_fields:
+    if sort not in TEXT_FIELDS:
         return jsonify({
             "error": "Bad Request",
             "message": f"Invalid sort field '{sort}'. Allowed: title, content."
         }), 400
 
-    if direction not in allowed_directions:
+    if direction not in SORT_DIRECTIONS:
         return jsonify({
             "error": "Bad Request",
             "message": f"Invalid direction '{direction}'. Allowed: asc, desc."
         }), 400
 
-    key_fn = lambda post: (post.get(sort) or "").lower()
-    reverse = (direction == "desc")
-    sorted_posts = sorted(POSTS, key=key_fn, reverse=reverse)
-    return jsonify(sorted_posts), 200
+    body = cached_list_body(state, sort, direction)
+    return conditional_response(body, f"{state.etag}-{sort}-{direction}")
 
 
 @app.route("/api/posts", methods=["POST"])
-def add_post():
+def add_post() -> tuple[Response, int]:
     """Add a new post. Body JSON must include 'title' and 'content'."""
+    global _STATE
     data = request.get_json(silent=True) or {}
-    title = data.get("title")
-    content = data.get("content")
-
-    missing = []
-    if not title:
-        missing.append("title")
-    if not content:
-        missing.append("content")
+    title = data.get("title", "")
+    content = data.get("content", "")
 
+    missing = is_blank(title) | is_blank(content) << 1
     if missing:
         return jsonify({
             "error": "Bad Request",
-            "message": f"Missing field(s): {', '.join(missing)}"
+            "message": MISSING_FIELDS_MESSAGES[missing]
         }), 400
 
-    new_post = {
-        "id": next_id(),
-        "title": title,
-        "content": content
-    }
-    POSTS.append(new_post)
+    with _WRITE_LOCK:
+        with transaction(db()) as conn:
+            (new_id,) = conn.execute(
+                "INSERT INTO posts (title, content) VALUES (?, ?) RETURNING id",
+                (title, content)
+            ).fetchone()
+            new_post = Post(new_id, title, content)
+            state = next_snapshot(conn, lambda current: with_post(current, new_post))
+        _STATE = state
     return jsonify(new_post), 201
 
 
 @app.route("/api/posts/<int:post_id>", methods=["DELETE"])
-def delete_post(post_id: int):
+def delete_post(post_id: int) -> tuple[Response, int]:
     """Delete a post by ID."""
-    idx = get_post_index_by_id(post_id)
-    if idx == -1:
-        return jsonify({
-            "error": "Not Found",
-            "message": f"Post with id {post_id} not found."
-        }), 404
-
-    POSTS.pop(idx)
+    global _STATE
+    with _WRITE_LOCK:
+        with transaction(db()) as conn:
+            cursor = conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+            if cursor.rowcount == 0:
+                return jsonify({
+                    "error": "Not Found",
+                    "message": f"Post with id {post_id} not found."
+                }), 404
+
+            state = next_snapshot(conn, lambda current: without_post(current, post_id))
+        _STATE = state
     return jsonify({"message": f"Post with id {post_id} has been deleted successfully."}), 200
 
 
 @app.route("/api/posts/<int:post_id>", methods=["PUT"])
-def update_post(post_id: int):
+def update_post(post_id: int) -> tuple[Response, int]:
     """Update a post by ID. Body JSON may include 'title' and/or 'content'."""
-    idx = get_post_index_by_id(post_id)
-    if idx == -1:
-        return jsonify({
-            "error": "Not Found",
-            "message": f"Post with id {post_id} not found."
-        }), 404
-
+    global _STATE
     data = request.get_json(silent=True) or {}
-    post = POSTS[idx]
 
-    if "title" in data and isinstance(data["title"], str):
-        post["title"] = data["title"]
-    if "content" in data and isinstance(data["content"], str):
-        post["content"] = data["content"]
+    with _WRITE_LOCK:
+        with transaction(db()) as conn:
+            row = conn.execute(
+                "SELECT id, title, content FROM posts WHERE id = ?", (post_id,)
+            ).fetchone()
+            if row is None:
+                return jsonify({
+                    "error": "Not Found",
+                    "message": f"Post with id {post_id} not found."
+                }), 404
+
+            post = Post(*row)
+            if "title" in data and isinstance(data["title"], str):
+                post = replace(post, title=data["title"])
+            if "content" in data and isinstance(data["content"], str):
+                post = replace(post, content=data["content"])
+            conn.execute(
+                "UPDATE posts SET title = ?, content = ? WHERE id = ?",
+                (post.title, post.content, post_id)
+            )
+            state = next_snapshot(conn, lambda current: with_post(current, post))
+        _STATE = state
 
     return jsonify(post), 200
 
 
 @app.route("/api/posts/search", methods=["GET"])
-def search_posts():
-    """Search posts by title and/or content (case-insensitive, partial match)."""
-    title_query = (request.args.get("title") or "").strip().lower()
-    content_query = (request.args.get("content") or "").strip().lower()
+def search_posts() -> tuple[Response, int]:
+    """
+    Search posts by title and/or content (case-insensitive, partial match).
+    Repeat a parameter (?title=a&title=b) to match any of several terms.
+    """
+    state = current_snapshot()
+    title_queries = query_terms("title")
+    content_queries = query_terms("content")
 
-    if not title_query and not content_query:
+    if not title_queries and not content_queries:
         return jsonify([]), 200
 
-    results = []
-    for post in POSTS:
-        title = post["title"].lower()
-        content = post["content"].lower()
-        match_title = bool(title_query) and (title_query in title)
-        match_content = bool(content_query) and (content_query in content)
-        if match_title or match_content:
-            results.append(post)
+    key = (title_queries, content_queries)
+    body = state.search_cache.get(key)
+    if body is None:
+        matched: set[int] = set()
+        if title_queries:
+            matched |= find_posts(state, "title", title_queries)
+        if content_queries:
+            matched |= find_posts(state, "content", content_queries)
+
+        results = [post_id for post_id in state.posts if post_id in matched]
+        body = posts_body(state, results)
+        if len(state.search_cache) < SEARCH_CACHE_SIZE:
+            state.search_cache[key] = body
 
-    return jsonify(results), 200
+    terms = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).hexdigest()
+    return conditional_response(body, f"{state.etag}-{terms}")
 
 # -------------------------
 # Swagger UI (API Docs)
@@ -169,5 +564,11 @@ app.register_blueprint(swagger_ui_blueprint, url_prefix=SWAGGER_URL)
 # -------------------------
 # Run
 # -------------------------
+# Local development only. In production, serve the app with a WSGI server:
+#   gunicorn -c gunicorn.conf.py backend_app:app
+# or behind a Rust-based server with its own I/O loop:
+#   granian --interface wsgi --host 0.0.0.0 --port 5002 backend_app:app
+# or, as a lighter drop-in alternative:
+#   python -c "import fastwsgi, backend_app; fastwsgi.run(wsgi_app=backend_app.app, host='0.0.0.0', port=5002)"
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=5002, debug=True)
\ No newline at end of file
+    app.run(host="127.0.0.1", port=5002, debug=False)
@@ -0,0 +1,17 @@
+"""
+Gunicorn settings for serving the Masterblog API in production.
+
+    gunicorn -c gunicorn.conf.py backend_app:app
+
+Posts are stored in SQLite (MASTERBLOG_DB), which every worker process
+shares, so reads scale with one worker per CPU. Each worker also runs
+threads, which the app's copy-on-write snapshots make safe.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("MASTERBLOG_BIND", "0.0.0.0:5002")
+worker_class = "gthread"
+workers = int(os.environ.get("MASTERBLOG_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("MASTERBLOG_THREADS", "8"))
+keepalive = 5